@@ -8,21 +8,62 @@ TO-DO:
 import os
 import time
 import importlib
+import shlex
+from collections import OrderedDict
 from pathlib import Path
 from modules.base_module import BaseModule
+from modules.utils.trie import Trie
 import json
 
+try:
+    import readline
+except ImportError: # Not available on Windows.
+    readline = None
+
+BUILTIN_COMMANDS = ("help", "list", "exit", "home")
+HOME_SUBCOMMANDS = ("list", "add", "use", "find")
+COMPLETION_LIMIT = 100
+# Cap on the total size of the data files of the loaded homes. The loaded
+# modules take more memory than their files, so this only bounds it roughly.
+LOADED_PARTITION_BYTES_LIMIT = 16 * 1024 * 1024
+
+HOME_HELP = """Home Command
+
+Usage: home [command] <args>
+    home list                               Lists the homes. The active one is marked with *.
+    home add <name>                         Creates a new home.
+    home use <name>                         Switches to the home.
+    home find <text>                        Searches every home for items containing the text.
+
+Examples:
+    home add "Rental Unit"                  Creates a home named Rental Unit.
+    home use Ev                             Switches to the home named Ev.
+    home find milk                          Lists the items mentioning milk in each home.
+"""
+
 class HomeSystem:
     def __init__(self):
         self.can_run = False
+        self.module_classes = {}
         self.modules = {}
         self.load_modules()
-        self.home_data_file = Path(__file__).parent / "data" / "home_data.json"
+        self.command_trie = Trie([*BUILTIN_COMMANDS, *self.module_classes])
+        self.home_subcommand_trie = Trie(HOME_SUBCOMMANDS)
+        self.completion_matches = []
+        self.data_dir = Path(__file__).parent / "data"
+        self.homes_dir = self.data_dir / "homes"
+        self.homes_file = self.data_dir / "homes.json"
+        self.home_trie = Trie()
+        self.loaded_homes = OrderedDict()
+        self.active_home = None
         self.home_data = {}
-  
+
 
     def load_modules(self):
-        """Dynamically load all modules from the 'modules' folder."""
+        """Dynamically find all module classes in the 'modules' folder.
+
+        The classes are instantiated per home, see load_partition.
+        """
         modules_dir = Path(__file__).parent / "modules"
         for file in modules_dir.glob("*_module.py"):
             if file.stem == "base_module":
@@ -35,7 +76,7 @@ class HomeSystem:
                     obj = getattr(module, attr)
                     if isinstance(obj, type) and issubclass(obj, BaseModule) and obj is not BaseModule:
                         command_name = module_name.replace("_module", "")
-                        self.modules[command_name] = obj()
+                        self.module_classes[command_name] = obj
             except Exception as e:
                 print(f"Error loading module '{module_name}': {e}")
 
@@ -49,7 +90,9 @@ class HomeSystem:
         if command_name == "help":
             if command_args:
                 module_name = command_args[0]
-                if module_name in self.modules:
+                if module_name == "home":
+                    print(HOME_HELP)
+                elif module_name in self.modules:
                     print(f"Help for '{module_name}' command:")
                     print(self.modules[module_name].get_help())
                 else:
@@ -58,10 +101,18 @@ class HomeSystem:
                 print("Available commands:")
                 print(" - help [command]: Show this help message or help for a specific command")
                 print(" - list: List all available commands")
+                print(" - home [command]: Manage and switch between homes")
                 print(" - exit: Exit the system")
                 print("\nFor detailed help on a specific command, type: help <command>")
             return
 
+        if command_name == "home":
+            try:
+                self.home_command(command_args)
+            except Exception as e:
+                print(f"Error executing command 'home': {e}")
+            return
+
         module = self.modules.get(command_name)
         if not module:
             print(f"Error: Command '{command_name}' not found.")
@@ -77,39 +128,232 @@ class HomeSystem:
         for module_name in self.modules:
             print(f" - {module_name}")
 
+    def setup_completion(self):
+        if readline is None:
+            return
+        readline.set_completer(self.complete)
+        readline.set_completer_delims(" \t\n")
+        if "libedit" in (readline.__doc__ or ""):
+            readline.parse_and_bind("bind ^I rl_complete")
+        else:
+            readline.parse_and_bind("tab: complete")
+
+    def complete(self, text, state):
+        """readline completer. Candidates are computed once per <tab> press."""
+        if state == 0:
+            try:
+                self.completion_matches = self.get_completions(
+                    readline.get_line_buffer(), readline.get_begidx(), readline.get_endidx())
+            except Exception:
+                self.completion_matches = []
+        if state < len(self.completion_matches):
+            return self.completion_matches[state]
+        return None
+
+    def get_completions(self, line, begidx, endidx):
+        head = line[:begidx]
+        # With an open quote the word started before begidx ("Whole mi<tab>).
+        start = head.rfind('"') if head.count('"') % 2 else begidx
+        prefix = line[start:endidx]
+        quoted = prefix.startswith('"')
+        prefix = prefix.lstrip('"')
+
+        try:
+            words = shlex.split(line[:start])
+        except ValueError:
+            words = line[:start].split()
+
+        if not words or (words[0] == "help" and len(words) == 1):
+            candidates = self.command_trie.starts_with(prefix, COMPLETION_LIMIT)
+        elif words[0] == "home" and len(words) == 1:
+            candidates = self.home_subcommand_trie.starts_with(prefix, COMPLETION_LIMIT)
+        elif words[0] == "home" and words[1] == "use" and len(words) == 2:
+            candidates = self.home_trie.starts_with(prefix, COMPLETION_LIMIT)
+        elif words[0] in self.modules:
+            candidates = self.modules[words[0]].complete(words[1:], prefix, COMPLETION_LIMIT)
+        else:
+            candidates = []
+
+        matches = []
+        for candidate in candidates:
+            if quoted or any(char.isspace() for char in candidate):
+                candidate = f'"{candidate}"'
+            # readline only replaces the text after begidx.
+            matches.append(candidate[begidx - start:])
+        return matches
+
     def load_home_data(self):
         print("Loading home data...")
-        if self.home_data_file.exists():
-            with open(self.home_data_file, 'r') as f:
-                self.home_data = json.load(f)
-                self.can_run = True
-                print("Home data loaded successfully.")
+        self.migrate_legacy_home()
+        homes = self.list_homes()
+        self.home_trie = Trie(homes)
+        if homes:
+            home_name = homes[0]
+            if self.homes_file.exists():
+                with open(self.homes_file, 'r') as f:
+                    active_home = json.load(f).get("active_home")
+                if active_home in homes:
+                    home_name = active_home
         else:
             print("No home data found. Creating one right now...")
-            self.create_new_home()
+            home_name = self.create_new_home()
 
-    def create_new_home(self):
-        data_dir = self.home_data_file.parent
-        if not data_dir.exists():
-            data_dir.mkdir(parents=True)
+        self.use_home(home_name)
+        self.can_run = True
+        print("Home data loaded successfully.")
 
+    def migrate_legacy_home(self):
+        """Moves the single-home data files into a partition of their own."""
+        legacy_file = self.data_dir / "home_data.json"
+        if self.homes_dir.exists() or not legacy_file.exists():
+            return
+        with open(legacy_file, 'r') as f:
+            home_data = json.load(f)
+        home_name = str(home_data.get("home_name", "")).lstrip(".").replace("/", "_").replace("\\", "_")
+        if not self.is_valid_home_name(home_name):
+            home_name = "Home"
+        home_data["home_name"] = home_name
+
+        partition = self.homes_dir / home_name
+        partition.mkdir(parents=True)
+        for file in self.data_dir.glob("*.json"):
+            if file != self.homes_file:
+                file.rename(partition / file.name)
+        with open(partition / "home_data.json", 'w') as f:
+            json.dump(home_data, f)
+
+    def list_homes(self):
+        if not self.homes_dir.exists():
+            return []
+        return sorted(
+            partition.name for partition in self.homes_dir.iterdir()
+            if (partition / "home_data.json").exists()
+        )
+
+    def is_valid_home_name(self, home_name):
+        return bool(home_name) and not home_name.startswith(".") and not any(sep in home_name for sep in "/\\")
+
+    def home_exists(self, home_name):
+        """Checks names without case, as the homes share a directory on
+        case-insensitive filesystems too."""
+        if (self.homes_dir / home_name / "home_data.json").exists():
+            return True
+        return any(existing.casefold() == home_name.casefold() for existing in self.list_homes())
+
+    def create_new_home(self, home_name=None):
         owner_name = input("What's your name? ")
-        home_name = input("Pick a name for your home? ")
-        self.home_data = {
-            "home_name": home_name,
-            "owner_name": owner_name,
-        }
-        with open(self.home_data_file, 'w') as f:
-            json.dump(self.home_data, f)
+        while home_name is None or not self.is_valid_home_name(home_name) or self.home_exists(home_name):
+            if home_name is not None:
+                print(f"'{home_name}' can't be used as a home name.")
+            home_name = input("Pick a name for your home? ")
+
+        partition = self.homes_dir / home_name
+        # The directory can be left over from a home whose creation failed
+        # before home_data.json was written. home_exists makes sure it
+        # doesn't belong to another home.
+        partition.mkdir(parents=True, exist_ok=True)
+        with open(partition / "home_data.json", 'w') as f:
+            json.dump({"home_name": home_name, "owner_name": owner_name}, f)
+        self.home_trie.insert(home_name)
 
         print(f"Thank you {owner_name}!\nNew home {home_name} created successfully.")
-        self.load_home_data()
+        return home_name
+
+    def load_partition(self, home_name):
+        """Reads a home's data and creates its module instances."""
+        partition = self.homes_dir / home_name
+        with open(partition / "home_data.json", 'r') as f:
+            home_data = json.load(f)
+        modules = {}
+        for command_name, module_class in self.module_classes.items():
+            try:
+                modules[command_name] = module_class(partition)
+            except Exception as e:
+                print(f"Error loading module '{command_name}': {e}")
+        return home_data, modules
+
+    def partition_size(self, home_name):
+        partition = self.homes_dir / home_name
+        return sum(file.stat().st_size for file in partition.iterdir() if file.is_file())
+
+    def use_home(self, home_name):
+        if home_name not in self.loaded_homes:
+            home_data, modules = self.load_partition(home_name)
+            self.loaded_homes[home_name] = (home_data, modules, self.partition_size(home_name))
+        self.loaded_homes.move_to_end(home_name)
+        self.home_data, self.modules, _ = self.loaded_homes[home_name]
+        self.active_home = home_name
+        with open(self.homes_file, 'w') as f:
+            json.dump({"active_home": home_name}, f)
+        self.evict_homes()
+
+    def evict_homes(self):
+        """Unloads the least recently used homes until the file sizes measured
+        when they were loaded add up to at most LOADED_PARTITION_BYTES_LIMIT.
+        The active home is never unloaded."""
+        total = sum(size for _, _, size in self.loaded_homes.values())
+        while total > LOADED_PARTITION_BYTES_LIMIT and len(self.loaded_homes) > 1:
+            _, (_, _, size) = self.loaded_homes.popitem(last=False)
+            total -= size
+
+    def iter_homes(self):
+        """Yields (home_name, modules) for every home, one partition at a time.
+
+        Homes that are not loaded are read just for the iteration and are not
+        cached, so a query over every home only ever holds one extra partition.
+        """
+        for home_name in self.list_homes():
+            if home_name in self.loaded_homes:
+                yield home_name, self.loaded_homes[home_name][1]
+            else:
+                yield home_name, self.load_partition(home_name)[1]
+
+    def find_in_homes(self, text):
+        found = False
+        for home_name, modules in self.iter_homes():
+            for command_name, module in modules.items():
+                for line in module.search(text):
+                    print(f"[{home_name}] {command_name}: {line}")
+                    found = True
+        if not found:
+            print(f"Nothing containing '{text}' found.")
+
+    def home_command(self, args):
+        try:
+            args = shlex.split(" ".join(args))
+        except ValueError:
+            print("Error. Please type <help home> for the correct usage.")
+            return
+
+        match args:
+            case [] | ["list"]:
+                for home_name in self.list_homes():
+                    marker = "*" if home_name == self.active_home else " "
+                    print(f" {marker} {home_name}")
+            case ["add", home_name]:
+                if not self.is_valid_home_name(home_name):
+                    print(f"'{home_name}' can't be used as a home name.")
+                elif self.home_exists(home_name):
+                    print(f"Home '{home_name}' already exists.")
+                else:
+                    self.create_new_home(home_name)
+            case ["use", home_name]:
+                if home_name not in self.home_trie:
+                    print(f"Error: Home '{home_name}' not found.")
+                else:
+                    self.use_home(home_name)
+                    print(f"Welcome to {self.home_data["home_name"]}, {self.home_data["owner_name"]}.")
+            case ["find", *words] if words:
+                self.find_in_homes(" ".join(words))
+            case _:
+                print(HOME_HELP)
 
     def run(self):
         self.load_home_data()
         os.system('cls' if os.name == 'nt' else 'clear')
         print(f"Welcome to {self.home_data["home_name"]}, {self.home_data["owner_name"]}. Type 'help' for assistance or 'exit' to quit.")
         if self.can_run:
+            self.setup_completion()
             while True:
                 try:
                     command_line = input("> ").strip()
@@ -1,8 +1,45 @@
+from modules.utils.trie import Trie
+from pathlib import Path
+
 class BaseModule:
+    def __init__(self, data_dir=None):
+        """data_dir is the partition directory of the home the module belongs to."""
+        self.data_dir = Path(data_dir) if data_dir else Path(__file__).parent.parent / "data"
+        self._subcommand_trie = Trie(self.get_subcommands())
+
     def execute(self, *args):
         """Override this method in modules to define their behavior."""
         raise NotImplementedError("Subclasses must implement this method.")
-        
+
     def get_help(self):
         """Returns help information for the module."""
         return self.__class__.__doc__ or "No help information available."
+
+    def search(self, text):
+        """Override this method to return the lines of the module's data containing text."""
+        return []
+
+    def get_subcommands(self):
+        """Override this method to list the subcommands handled by execute."""
+        return ()
+
+    def _sync_id_trie(self, id_trie, count):
+        """Makes id_trie hold the IDs 1..count.
+
+        Modules number their items 1..n, so only the tail of the trie ever
+        changes and this costs as much as the number of IDs added or removed.
+        """
+        while len(id_trie) < count:
+            id_trie.insert(str(len(id_trie) + 1))
+        while len(id_trie) > count:
+            id_trie.remove(str(len(id_trie)))
+
+    def complete(self, args, text, limit=None):
+        """Returns completion candidates for text.
+
+        args holds the words already typed after the command name. The default
+        only completes the subcommand; override it to complete arguments too.
+        """
+        if args:
+            return []
+        return self._subcommand_trie.starts_with(text, limit)
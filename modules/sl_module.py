@@ -1,6 +1,7 @@
 from modules.base_module import BaseModule
 from modules.utils.tabler import Tabler
-from pathlib import Path
+from modules.utils.trie import Trie
+from modules.utils.quantity import add_quantities
 import json
 import os
 import shlex
@@ -12,11 +13,14 @@ Usage: sl [command] <args>
     sl add                                  Creates item adding dialogue.
     sl add <name> <quantity>                Adds new item.
     sl add <"name"> <"quantity">            Adds new item with multiple words.
+                                            Adding an item already on the list adds the quantities up.
     sl remove                               Queries the desired item ID(s) to remove and removes them.
     sl remove <item_id(s)>                  Removes the item(s) seperated with a comma or space interchangeably. (2, 4 5 is allowed and parsed as 2nd, 4th and 5th element.)
     sl edit                                 Queries for the edit. 
     sl edit <item_id> <name> <quantity>     Edits the desired item. 
     sl edit <item_id> <"name"> <"quantity"> Edits the desired item with multiple words. Using quotation marks without content leaves value unchanged.
+                                            Renaming an item to one already on the list merges the two.
+    sl dedupe                               Merges the items with the same name.
     sl clear                                Clear the shopping list.
     sl list                                 Lists the shopping list.
     sl print                                Pretty prints the shopping list.
@@ -24,15 +28,23 @@ Usage: sl [command] <args>
 Examples:
     sl add "Milk" "4L"                      Adds milk item with 4L quantity to the list.
     sl add Butter 2pcs                      Adds butter item with 2pcs quantity to the list.                  
+    sl add milk 500ml                       Updates the milk item's quantity to 4.5L.
     sl remove 2, 4, 12                      Removes 2nd, 4th and 12th items from the list.
     sl remove 1 7 25                        Removes first, 7th and 25th items from the list.
     sl edit 5 "Rice" ""                     Edits the 5th element's name to "Rice".
     sl edit 8 Bread 1                       Edits the 8th element's name to Bread and quantity to 1.
 """
 
-    def __init__(self):
-        self.slitems_file = Path(__file__).parent.parent / "data" / "shoppinglist.json"
+    def __init__(self, data_dir=None):
+        super().__init__(data_dir)
+        self.slitems_file = self.data_dir / "shoppinglist.json"
         self.slitems = self._load_slitems()
+        self.name_index = {}
+        for item in self.slitems:
+            self.name_index.setdefault(self._normalize_name(item['name']), item)
+        self.name_trie = Trie(item['name'] for item in self.slitems)
+        self.id_trie = Trie()
+        self._sync_id_trie(self.id_trie, len(self.slitems))
 
     def _load_slitems(self):
         if self.slitems_file.exists():
@@ -51,6 +63,65 @@ Examples:
     def _reindex_slitems(self):
         for index, sl in enumerate(self.slitems, 1):
             sl['id'] = index
+        self._sync_id_trie(self.id_trie, len(self.slitems))
+
+    def _normalize_name(self, name):
+        return " ".join(name.split()).casefold()
+
+    def _unindex_item(self, item):
+        key = self._normalize_name(item['name'])
+        if self.name_index.get(key) is item:
+            del self.name_index[key]
+            # Lists saved before the index existed can still hold duplicates
+            # (until sl dedupe), so the next one takes over the key.
+            for other in self.slitems:
+                if other is not item and self._normalize_name(other['name']) == key:
+                    self.name_index[key] = other
+                    break
+        self.name_trie.remove(item['name'])
+
+    def _update_item(self, item, name, quantity):
+        if name == "" and quantity == "":
+            return "Nothing changed."
+
+        item_id = item['id']
+        if quantity != "":
+            item['quantity'] = quantity
+        if name != "" and name != item['name']:
+            other = self.name_index.get(self._normalize_name(name))
+            self._unindex_item(item)
+            if other is not None and other is not item:
+                # Renaming onto another item's name merges them like sl add does.
+                other['quantity'] = add_quantities(other['quantity'], item['quantity'])
+                self.slitems.remove(item)
+                self._reindex_slitems()
+                self._save_slitems()
+                return f"Item {item_id} merged into {other['name']}. Quantity updated to {other['quantity']}."
+            item['name'] = name
+            self.name_index[self._normalize_name(name)] = item
+            self.name_trie.insert(name)
+
+        self._save_slitems()
+        return f"Item {item_id} edited!"
+
+    def _insert_item(self, name, quantity):
+        item = self.name_index.get(self._normalize_name(name))
+        if item is not None:
+            item['quantity'] = add_quantities(item['quantity'], quantity)
+            self._save_slitems()
+            return f"{item['name']} is already on the list. Quantity updated to {item['quantity']}."
+
+        item = {
+            'id': len(self.slitems) + 1,
+            'name': name,
+            'quantity': quantity,
+        }
+        self.slitems.append(item)
+        self.name_index[self._normalize_name(name)] = item
+        self.name_trie.insert(name)
+        self._sync_id_trie(self.id_trie, len(self.slitems))
+        self._save_slitems()
+        return f"{name} with quantity of {quantity} added to the list."
 
     def _list_items(self):
         if not self.slitems:
@@ -92,30 +163,13 @@ Examples:
                 args = shlex.split(" ".join(item_args))
                 if len(args) > 2: # optional. maybe a bit anti-user pattern?
                     return "Error. Please type <help sl> for the correct usage."
-                item = {
-                    'id': len(self.slitems) + 1,
-                    'name': args[0],
-                    'quantity': args[1],
-                }
-                self.slitems.append(item)
-                self._reindex_slitems()
-                self._save_slitems()
-                return f"{args[0]} with quantity of {args[1]} added to the list."
+                return self._insert_item(args[0], args[1])
             except (ValueError, IndexError):
                 return "Error. Please type <help sl> for the correct usage"
         
         name = input("Name of the item? ")
         quantity = input("Quantity? ")
-
-        item = {
-            'id': len(self.slitems) + 1,
-            'name': name,
-            'quantity': quantity,
-        }
-        self.slitems.append(item)
-        self._reindex_slitems()
-        self._save_slitems()
-        return f"{name} with quantity of {quantity} added to the list."
+        return self._insert_item(name, quantity)
 
     def _remove_item(self, *item_ids):
         if item_ids:
@@ -138,6 +192,7 @@ Examples:
                 for item in self.slitems:
                     if item['id'] == item_id:
                         self.slitems.remove(item)
+                        self._unindex_item(item)
                         valid.append(item_id)
                         item_found = True
                         break
@@ -175,6 +230,7 @@ Examples:
             for item in self.slitems:
                 if item['id'] == item_id:
                     self.slitems.remove(item)
+                    self._unindex_item(item)
                     valid.append(item_id)
                     item_found = True
                     break
@@ -206,10 +262,7 @@ Examples:
                 
                 for item in self.slitems:
                     if item['id'] == id:
-                        item['name'] = args[1] if args[1] != "" else item['name']
-                        item['quantity'] = args[2] if args[2] != "" else item['quantity']
-                        self._save_slitems()
-                        return f"Item {id} edited!" if args[1] != "" or args[2] != "" else "Nothing changed."
+                        return self._update_item(item, args[1], args[2])
                 return f"Item {id} not found."
 
             except (IndexError, ValueError):
@@ -228,18 +281,41 @@ Examples:
 
         for item in self.slitems:
             if item['id'] == id_input:
-                item['name'] = name_input if name_input != "" else item['name']
-                item['quantity'] = quantity_input if quantity_input != "" else item['quantity']
-                self._save_slitems()
-
-                return f"Item {id_input} edited!" if name_input != "" or quantity_input != "" else "Nothing changed."
+                return self._update_item(item, name_input, quantity_input)
         return f"Item {id_input} not found."
     
+    def _dedupe_items(self):
+        # Single pass: the first item with a name keeps its place and ID,
+        # later ones are merged into it.
+        name_index = {}
+        items = []
+        for item in self.slitems:
+            key = self._normalize_name(item['name'])
+            kept = name_index.get(key)
+            if kept is None:
+                name_index[key] = item
+                items.append(item)
+            else:
+                kept['quantity'] = add_quantities(kept['quantity'], item['quantity'])
+                self.name_trie.remove(item['name'])
+
+        merged = len(self.slitems) - len(items)
+        if not merged:
+            return "No duplicate items found."
+        self.slitems = items
+        self.name_index = name_index
+        self._reindex_slitems()
+        self._save_slitems()
+        return f"{merged} duplicate item(s) merged."
+
     def _clear_items(self):
         if self.slitems:
             confirm = input("Clear the shopping list? (Y/n) ")
             if confirm.lower() == "y" or confirm == "":
                 self.slitems = []
+                self.name_index = {}
+                self.name_trie.clear()
+                self._sync_id_trie(self.id_trie, len(self.slitems))
                 self._save_slitems()
                 return "Shopping list cleared."
             else:
@@ -247,6 +323,31 @@ Examples:
         else:
             return "Shopping list is empty."
     
+    def search(self, text):
+        text = text.lower()
+        return [
+            f"{item['id']}. {item['name']} ({item['quantity']})"
+            for item in self.slitems if text in item['name'].lower()
+        ]
+
+    def get_subcommands(self):
+        return ('add', 'remove', 'edit', 'dedupe', 'clear', 'list', 'print')
+
+    def complete(self, args, text, limit=None):
+        if not args:
+            return super().complete(args, text, limit)
+        match args[0]:
+            case 'add' if len(args) == 1:
+                return self.name_trie.starts_with(text, limit)
+            case 'remove':
+                return self.id_trie.starts_with(text, limit)
+            case 'edit' if len(args) == 1:
+                return self.id_trie.starts_with(text, limit)
+            case 'edit' if len(args) == 2:
+                return self.name_trie.starts_with(text, limit)
+            case _:
+                return []
+
     def execute(self, *args):
         if args:
             match args[0]:
@@ -260,6 +361,8 @@ Examples:
                     return self._remove_item(*args[1:])
                 case 'edit':
                     return self._edit_item(*args[1:])
+                case 'dedupe':
+                    return self._dedupe_items()
                 case 'clear':
                     return self._clear_items()
                 case _:
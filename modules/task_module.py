@@ -1,5 +1,5 @@
 from modules.base_module import BaseModule
-from pathlib import Path
+from modules.utils.trie import Trie
 import json
 from datetime import datetime
 import os
@@ -19,9 +19,12 @@ task undo <task_id(s)>              Undo task(s).
 task list                           List all the tasks.
     """
 
-    def __init__(self):
-        self.tasks_file = Path(__file__).parent.parent / "data" / "tasks.json"
+    def __init__(self, data_dir=None):
+        super().__init__(data_dir)
+        self.tasks_file = self.data_dir / "tasks.json"
         self.tasks = self._load_tasks()
+        self.id_trie = Trie()
+        self._sync_id_trie(self.id_trie, len(self.tasks))
 
     def _load_tasks(self):
         if self.tasks_file.exists():
@@ -146,6 +149,7 @@ task list                           List all the tasks.
     def _reindex_tasks(self):
         for index, task in enumerate(self.tasks, 1):
             task['id'] = index
+        self._sync_id_trie(self.id_trie, len(self.tasks))
 
     def _remove_task(self, *task_ids):
         if not task_ids:
@@ -195,6 +199,27 @@ task list                           List all the tasks.
                 return f"Task {task_id} edited!"
         return f"Task with ID {task_id} not found."
     
+    def search(self, text):
+        text = text.lower()
+        return [
+            f"{task['id']}. [{'x' if task['completed'] else ' '}] - {task['content']}"
+            for task in self.tasks if text in task['content'].lower()
+        ]
+
+    def get_subcommands(self):
+        return ("add", "list", "complete", "undo", "remove", "edit")
+
+    def complete(self, args, text, limit=None):
+        if not args:
+            return super().complete(args, text, limit)
+        match args[0]:
+            case "complete" | "undo" | "remove":
+                return self.id_trie.starts_with(text, limit)
+            case "edit" if len(args) == 1:
+                return self.id_trie.starts_with(text, limit)
+            case _:
+                return []
+
     def execute(self, *args):
         if args:
             match args[0]:
@@ -0,0 +1,107 @@
+import re
+from decimal import Decimal
+
+# Unit -> (base unit, factor). Units of the same base can be added together.
+UNITS = {
+    "": ("pcs", 1),
+    "x": ("pcs", 1),
+    "pc": ("pcs", 1),
+    "pcs": ("pcs", 1),
+    "piece": ("pcs", 1),
+    "pieces": ("pcs", 1),
+    "dozen": ("pcs", 12),
+    "mg": ("g", 0.001),
+    "g": ("g", 1),
+    "kg": ("g", 1000),
+    "ml": ("ml", 1),
+    "cl": ("ml", 10),
+    "dl": ("ml", 100),
+    "l": ("ml", 1000),
+}
+
+QUANTITY_PATTERN = re.compile(r"^\s*(\d+(?:[.,]\d+)?)(\s*)([^\d\s]*)\s*$")
+
+
+def _match_quantity(text):
+    match = QUANTITY_PATTERN.match(text)
+    if not match or match.group(3).lower() not in UNITS:
+        return None
+    return match
+
+
+def parse_quantity(text):
+    """Splits a quantity like "4L", "2 pcs" or "1,5kg" into (amount, unit).
+
+    Returns None if the text is not a number followed by a known unit.
+    """
+    match = _match_quantity(text)
+    if not match:
+        return None
+    return float(match.group(1).replace(",", ".")), match.group(3)
+
+
+def format_amount(amount, decimal_separator="."):
+    # 12 significant digits drop float noise (0.1 + 0.2 = 0.30000000000000004)
+    # but keep every digit a quantity is typed with.
+    text = format(Decimal(f"{amount:.12g}").normalize(), "f")
+    return text.replace(".", decimal_separator)
+
+
+def _is_clean(amount):
+    return abs(amount - round(amount, 3)) <= 1e-12 * abs(amount)
+
+
+def _unit_for(total, base):
+    """Picks the largest unit of the base that holds total to 3 decimals.
+
+    If none does, the smallest unit is used so no digits are dropped.
+    """
+    factors = sorted({factor for unit_base, factor in UNITS.values() if unit_base == base}, reverse=True)
+    factor = next((factor for factor in factors if _is_clean(total / factor)), factors[-1])
+    if factor == 1:
+        return total, base
+    unit = next(unit for unit, (unit_base, unit_factor) in UNITS.items() if unit_base == base and unit_factor == factor)
+    return total / factor, unit
+
+
+def add_quantities(first, second):
+    """Adds two quantity strings, keeping the unit and formatting of the first.
+
+    When the sum isn't a clean amount of that unit it is given in the largest
+    unit that holds it exactly. An empty quantity changes nothing. Quantities
+    that can't be parsed or whose units don't convert into each other are
+    joined with a "+" instead.
+
+    >>> add_quantities("1L", "500ml")
+    '1.5L'
+    >>> add_quantities("1,5kg", "250g")
+    '1,75kg'
+    >>> add_quantities("1 dozen", "2")
+    '14 pcs'
+    >>> add_quantities("1g", "1.5mg")
+    '1001.5mg'
+    >>> add_quantities("1kg", "0.5mg")
+    '1000000.5mg'
+    >>> add_quantities("4L", "")
+    '4L'
+    >>> add_quantities("4L", "1kg")
+    '4L + 1kg'
+    """
+    if not second.strip():
+        return first
+    if not first.strip():
+        return second
+
+    a, b = _match_quantity(first), _match_quantity(second)
+    if a and b:
+        unit = a.group(3)
+        base_a, factor_a = UNITS[unit.lower()]
+        base_b, factor_b = UNITS[b.group(3).lower()]
+        if base_a == base_b:
+            total = parse_quantity(first)[0] * factor_a + parse_quantity(second)[0] * factor_b
+            amount = total / factor_a
+            if not _is_clean(amount):
+                amount, unit = _unit_for(total, base_a)
+            decimal_separator = "," if "," in a.group(1) or ("." not in a.group(1) and "," in b.group(1)) else "."
+            return f"{format_amount(amount, decimal_separator)}{a.group(2)}{unit}"
+    return f"{first} + {second}"
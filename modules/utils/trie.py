@@ -0,0 +1,94 @@
+class _TrieNode:
+    __slots__ = ("children", "count")
+
+    def __init__(self):
+        self.children = {}
+        self.count = 0
+
+
+class Trie:
+    """Prefix tree used for tab completion.
+
+    The same word can be inserted more than once (two shopping items with the
+    same name), so every terminal node keeps a counter and the word is only
+    dropped when the last copy is removed.
+    """
+
+    def __init__(self, words=()):
+        self.root = _TrieNode()
+        self.size = 0
+        for word in words:
+            self.insert(word)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, word):
+        node = self._find(word)
+        return node is not None and node.count > 0
+
+    def _find(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def insert(self, word):
+        node = self.root
+        for char in word:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+        node.count += 1
+        self.size += 1
+
+    def remove(self, word):
+        """Removes one copy of the word. Returns False if it was not there."""
+        path = [self.root]
+        for char in word:
+            node = path[-1].children.get(char)
+            if node is None:
+                return False
+            path.append(node)
+
+        if path[-1].count == 0:
+            return False
+        path[-1].count -= 1
+        self.size -= 1
+
+        # Prune the branch that no longer leads to any word.
+        for depth in range(len(word), 0, -1):
+            node = path[depth]
+            if node.count or node.children:
+                break
+            del path[depth - 1].children[word[depth - 1]]
+        return True
+
+    def clear(self):
+        self.root = _TrieNode()
+        self.size = 0
+
+    def starts_with(self, prefix, limit=None):
+        """Returns the distinct words starting with prefix in sorted order.
+
+        Only the subtree under the prefix is visited and the walk stops after
+        limit words, so the cost does not grow with the total number of words.
+        """
+        node = self._find(prefix)
+        if node is None:
+            return []
+
+        result = []
+        stack = [(prefix, node)]
+        while stack:
+            word, node = stack.pop()
+            if node.count:
+                result.append(word)
+                if limit is not None and len(result) >= limit:
+                    break
+            for char in sorted(node.children, reverse=True):
+                stack.append((word + char, node.children[char]))
+        return result